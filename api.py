@@ -8,12 +8,14 @@ if os.path.exists(dotenv_path):
 else:
     print(f"Warning: .env file not found at {dotenv_path}")
 
-import shutil
-import tempfile
+import asyncio
+import fcntl
+from contextlib import contextmanager
 from typing import Optional
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 
@@ -44,6 +46,45 @@ app.add_middleware(
 
 document_processor = DocumentProcessor(index_path=FAISS_INDEX_PATH)
 qa_runnable = None
+# mtime of index.faiss when the chain was last built. In multi-worker mode
+# only the worker that handled an upload rebuilds its chain; the others spot
+# the changed file and reload before serving.
+qa_index_mtime = None
+
+# Serializes PDF processing across concurrent uploads within this worker —
+# parsing and encoding already use all cores, so running two uploads at once
+# just thrashes the BLAS/OpenMP thread pools.
+processing_lock = asyncio.Lock()
+
+# Lockfile for serialization across workers: save_local writes index.faiss
+# and index.pkl non-atomically, so two processes saving at once could leave a
+# mismatched pair on disk.
+INDEX_LOCK_PATH = FAISS_INDEX_PATH + ".lock"
+
+
+@contextmanager
+def _index_write_lock():
+    """Holds an exclusive cross-process lock on the index for the duration."""
+    with open(INDEX_LOCK_PATH, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _process_pdf(pdf_bytes: bytes, filename: str):
+    """
+    Parses, embeds, and saves the index under the cross-process lock.
+
+    Runs in a worker thread, so blocking on the flock stalls only that
+    thread, not the event loop.
+    """
+    with _index_write_lock():
+        doc_chunks = document_processor.load_and_split_pdf(pdf_bytes, source_name=filename)
+        if not doc_chunks:
+            return None
+        return document_processor.create_and_save_vector_store(doc_chunks)
 
 
 class QueryRequest(BaseModel):
@@ -59,10 +100,20 @@ class UploadResponse(BaseModel):
     index_path: str
 
 # --- Helper Functions ---
+def _index_mtime():
+    """Returns the on-disk FAISS index file's mtime, or None if absent."""
+    try:
+        return os.path.getmtime(os.path.join(FAISS_INDEX_PATH, "index.faiss"))
+    except OSError:
+        return None
+
+
 def initialize_qa_chain():
     """Loads vector store and initializes the QA chain."""
-    global qa_runnable
+    global qa_runnable, qa_index_mtime
     print("Attempting to initialize QA chain...")
+    # Record which index version this chain was built against
+    qa_index_mtime = _index_mtime()
     vector_store = document_processor.get_vector_store() # Get the currently loaded store
     if vector_store:
         qa_runnable = create_qa_chain(vector_store)
@@ -90,6 +141,9 @@ def initialize_qa_chain():
 async def startup_event():
     """Initialize the QA chain on startup if the index exists."""
     print("FastAPI startup: Initializing QA chain...")
+    # Warm the encoder first so the first real query doesn't pay for lazy
+    # tokenizer/kernel initialization.
+    document_processor.warm_up()
     initialize_qa_chain()
 
 @app.post("/upload", response_model=UploadResponse)
@@ -100,64 +154,76 @@ async def upload_pdf(background_tasks: BackgroundTasks, file: UploadFile = File(
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Invalid file type. Only PDFs are accepted.")
 
-    # Use a temporary directory for robust file handling
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_file_path = os.path.join(temp_dir, file.filename)
-
-        # Save the uploaded file temporarily
-        try:
-            with open(temp_file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-        except Exception as e:
-             raise HTTPException(status_code=500, detail=f"Failed to save uploaded file: {e}")
-        finally:
-            file.file.close() # Ensure file handle is closed
+    # Read the upload into memory and hand the bytes straight to the PDF
+    # parser — a temp-file round-trip would write and re-read the whole PDF
+    # for nothing.
+    try:
+        pdf_bytes = await file.read()
+    except Exception as e:
+         raise HTTPException(status_code=500, detail=f"Failed to read uploaded file: {e}")
+    finally:
+        file.file.close() # Ensure file handle is closed
 
-        print(f"Temporarily saved PDF to: {temp_file_path}")
+    print(f"Received PDF upload: {file.filename} ({len(pdf_bytes)} bytes)")
 
-        # Process the PDF: Load and Split
-        print("Loading and splitting PDF...")
-        doc_chunks = document_processor.load_and_split_pdf(temp_file_path)
+    # Parsing and embedding are heavy, blocking CPU work — run them in a
+    # worker thread so /query handlers keep progressing on the event loop.
+    async with processing_lock:
+        print("Processing PDF (parse, split, embed, index)...")
+        vector_store = await asyncio.to_thread(_process_pdf, pdf_bytes, file.filename)
 
-        if not doc_chunks:
-            raise HTTPException(status_code=500, detail=f"Failed to process PDF: {file.filename}")
+    if not vector_store:
+        raise HTTPException(status_code=500, detail=f"Failed to process PDF: {file.filename}")
 
-        # Create and Save Vector Store
-        print("Creating and saving vector store...")
-        vector_store = document_processor.create_and_save_vector_store(doc_chunks)
+    # Initialize the QA chain in the background after upload and processing
+    # This ensures the chain is ready for subsequent queries
+    print("Scheduling QA chain initialization in background...")
+    background_tasks.add_task(initialize_qa_chain)
 
-        if not vector_store:
-            raise HTTPException(status_code=500, detail="Failed to create vector store.")
+    return UploadResponse(
+        message="File processed successfully and vector store created/updated.",
+        filename=file.filename,
+        index_path=document_processor.index_path
+    )
 
-        # Initialize the QA chain in the background after upload and processing
-        # This ensures the chain is ready for subsequent queries
-        print("Scheduling QA chain initialization in background...")
-        background_tasks.add_task(initialize_qa_chain)
 
-        return UploadResponse(
-            message="File processed successfully and vector store created/updated.",
-            filename=file.filename,
-            index_path=document_processor.index_path
-        )
+def _require_qa_chain():
+    """
+    Returns the QA chain, (re)initializing it on demand, or raises 503.
 
+    Rebuilds when index.faiss has changed on disk since the chain was built —
+    in multi-worker mode another worker may have processed an upload.
 
-@app.post("/query", response_model=QueryResponse)
-async def query_pdf(query: QueryRequest):
-    """
-    Accepts a question and returns an answer based on the processed PDF.
+    Blocking (disk read, and hub.pull's HTTPS round-trip on first build):
+    async handlers must call it via asyncio.to_thread.
     """
     global qa_runnable
+    if qa_runnable and _index_mtime() != qa_index_mtime:
+        print("FAISS index changed on disk. Reloading vector store and QA chain...")
+        document_processor.vector_store = document_processor._load_vector_store()
+        qa_runnable = None
     if not qa_runnable:
         # Try to initialize again if it wasn't ready at startup or after upload
         print("QA chain not ready. Trying to initialize now...")
         initialize_qa_chain()
         if not qa_runnable:
             raise HTTPException(status_code=503, detail="Vector store not ready or QA chain failed to initialize. Please upload a document first.")
+    return qa_runnable
+
+
+@app.post("/query", response_model=QueryResponse)
+async def query_pdf(query: QueryRequest):
+    """
+    Accepts a question and returns an answer based on the processed PDF.
+    """
+    # Off the event loop: may reload the index and rebuild the chain.
+    chain = await asyncio.to_thread(_require_qa_chain)
 
     print(f"Received query: {query.question}")
     try:
-        # Invoke the QA chain
-        result = qa_runnable.invoke({"input": query.question})
+        # ainvoke keeps the event loop free during the Groq round-trip so
+        # concurrent requests aren't stalled behind this one.
+        result = await chain.ainvoke({"input": query.question})
         answer = result.get("answer", "Sorry, I couldn't find an answer to that question.")
         print(f"Generated answer: {answer}")
 
@@ -171,6 +237,41 @@ async def query_pdf(query: QueryRequest):
         raise HTTPException(status_code=500, detail=f"Error processing query: {e}")
 
 
+@app.post("/query/stream")
+async def query_pdf_stream(query: QueryRequest):
+    """
+    Streams the answer token-by-token as it is generated, so clients see
+    first-token latency instead of waiting for the full completion.
+    """
+    # Off the event loop: may reload the index and rebuild the chain.
+    chain = await asyncio.to_thread(_require_qa_chain)
+
+    print(f"Received streaming query: {query.question}")
+
+    async def answer_generator():
+        try:
+            async for chunk in chain.astream({"input": query.question}):
+                token = chunk.get("answer")
+                if token:
+                    yield token
+        except Exception as e:
+            print(f"Error during streamed QA chain invocation: {e}")
+            yield "\n[Error generating answer.]"
+
+    return StreamingResponse(answer_generator(), media_type="text/event-stream")
+
+
 if __name__ == "__main__":
     print("Starting FastAPI server...")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Import string (not the app object) is required for multi-worker mode;
+    # each worker imports this module fresh, so the DocumentProcessor and QA
+    # chain initialize per process via the startup event. uvloop + httptools
+    # (bundled with uvicorn[standard]) cut per-request async overhead.
+    uvicorn.run(
+        "api:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=max(2, (os.cpu_count() or 2) // 2),
+        loop="uvloop",
+        http="httptools",
+    )
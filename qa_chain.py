@@ -1,4 +1,5 @@
 import os
+from collections import OrderedDict
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -11,6 +12,63 @@ from langchain_core.runnables import Runnable
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 RETRIEVAL_QA_CHAT_PROMPT_HUB = "langchain-ai/retrieval-qa-chat"
+RETRIEVAL_CACHE_SIZE = 256
+
+# Cached at module scope: the chain gets rebuilt on startup, after every
+# upload, and on first query — but the LLM client and the hub prompt (an
+# HTTPS round-trip to LangChain Hub) never change between rebuilds.
+_LLM: Optional[ChatGroq] = None
+_PROMPT = None
+
+
+def _get_llm_and_prompt():
+    """Returns the shared ChatGroq client and retrieval prompt, building them once."""
+    global _LLM, _PROMPT
+    if _LLM is None:
+        _LLM = ChatGroq(
+            model_name="llama-3.1-8b-instant",
+            groq_api_key=GROQ_API_KEY,  # Use the module-level variable
+            temperature=0.0,  # Keep temperature low for factual QA
+            max_retries=2,
+        )
+    if _PROMPT is None:
+        _PROMPT = hub.pull(RETRIEVAL_QA_CHAT_PROMPT_HUB)
+    return _LLM, _PROMPT
+
+
+def _enable_retrieval_cache(vector_store: FAISS, maxsize: int = RETRIEVAL_CACHE_SIZE) -> None:
+    """
+    Wraps the vector store's similarity_search in an LRU cache keyed on the
+    question, so repeated or retried questions skip the encoder forward pass
+    and the index scan entirely.
+
+    The wrap lives on the FAISS store (a plain class we can safely patch —
+    the embeddings object is a pydantic model that forbids extra attributes).
+    Idempotent: installed once per store, so rebuilding the chain does not
+    stack caches.
+    """
+    if getattr(vector_store, "_retrieval_cache_installed", False):
+        return
+
+    original_search = vector_store.similarity_search
+    cache = OrderedDict()
+
+    def cached_similarity_search(query, k=4, **kwargs):
+        if kwargs:
+            # filters etc. may not be hashable; don't try to cache those
+            return original_search(query, k=k, **kwargs)
+        key = (query, k)
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        result = original_search(query, k=k)
+        cache[key] = result
+        if len(cache) > maxsize:
+            cache.popitem(last=False)
+        return result
+
+    vector_store.similarity_search = cached_similarity_search
+    vector_store._retrieval_cache_installed = True
 
 
 def create_qa_chain(vector_store: FAISS = None) -> Optional[Runnable]:
@@ -30,16 +88,12 @@ def create_qa_chain(vector_store: FAISS = None) -> Optional[Runnable]:
         print("Error: Vector store is not initialized.")
         return None
     try:
-        # Initialize the Groq LLM
-        llm = ChatGroq(
-            model_name="llama-3.1-8b-instant",
-            groq_api_key=GROQ_API_KEY,  # Use the module-level variable
-            temperature=0.0,  # Keep temperature low for factual QA
-            max_retries=2,
-        )
+        # Reuse the cached Groq LLM and hub prompt; only the retriever depends
+        # on the (possibly new) vector store.
+        llm, retrieval_qa_chat_prompt = _get_llm_and_prompt()
 
-        # Pull the retrieval QA chat prompt from Langchain Hub
-        retrieval_qa_chat_prompt = hub.pull(RETRIEVAL_QA_CHAT_PROMPT_HUB)
+        # Cache retrieval results before wiring up the retriever
+        _enable_retrieval_cache(vector_store)
 
         # Create the retriever from the vector store
         # You can adjust search_kwargs as needed (e.g., k for number of documents)
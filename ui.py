@@ -11,6 +11,10 @@ st.set_page_config(page_title="Chat with PDF", page_icon="📄", layout="wide")
 st.title("💬 Chat with your PDF")
 st.caption("Upload a PDF and ask questions about its content.")
 
+# Reuse one keep-alive session per browser session — a fresh requests.post
+# pays a full TCP (+TLS) handshake for every upload/query.
+if "http" not in st.session_state:
+    st.session_state.http = requests.Session()
 if "messages" not in st.session_state:
     st.session_state.messages = []
 if "uploaded_file_processed" not in st.session_state:
@@ -33,7 +37,7 @@ def call_upload_api(uploaded_file) -> bool:
     files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
     try:
         with st.spinner(f"Processing {uploaded_file.name}..."):
-            response = requests.post(UPLOAD_ENDPOINT, files=files, timeout=600) # Increased timeout for potentially long processing
+            response = st.session_state.http.post(UPLOAD_ENDPOINT, files=files, timeout=600) # Increased timeout for potentially long processing
         if response.status_code == 200:
             response_data = response.json()
             st.success(f"✅ Successfully processed: {response_data.get('filename', 'Unknown file')}")
@@ -55,7 +59,7 @@ def call_query_api(question: str) -> str:
     payload = {"question": question}
     try:
         with st.spinner("Thinking..."):
-            response = requests.post(QUERY_ENDPOINT, json=payload, timeout=120) # Timeout for LLM response
+            response = st.session_state.http.post(QUERY_ENDPOINT, json=payload, timeout=120) # Timeout for LLM response
         if response.status_code == 200:
             response_data = response.json()
             return response_data.get("answer", "Sorry, I couldn't find an answer.")